@@ -29,6 +29,9 @@ CLEANED_TRIPS_CSV = os.path.join(PROCESSED_DATA_DIR, "cleaned_trips.csv")
 ZONE_HOUR_METRICS_JSON = os.path.join(PROCESSED_DATA_DIR, "zone_hour_metrics.json")
 ZONE_REVENUE_METRICS_JSON = os.path.join(PROCESSED_DATA_DIR, "zone_revenue_metrics.json")
 ZONE_RISK_SCORES_JSON = os.path.join(PROCESSED_DATA_DIR, "zone_risk_scores.json")
+ZONE_HOUR_METRICS_PARQUET = os.path.join(PROCESSED_DATA_DIR, "zone_hour_metrics.parquet")
+ZONE_REVENUE_METRICS_PARQUET = os.path.join(PROCESSED_DATA_DIR, "zone_revenue_metrics.parquet")
+ZONE_RISK_SCORES_PARQUET = os.path.join(PROCESSED_DATA_DIR, "zone_risk_scores.parquet")
 EXCLUDED_RECORDS_LOG = os.path.join(LOGS_DIR, "excluded_records.log")
 
 # ============================================================================
@@ -45,13 +48,13 @@ VALIDATION_THRESHOLDS = {
 }
 
 # Valid rate codes (standard NYC taxi rate codes)
-VALID_RATE_CODES = [1, 2, 3, 4, 5]
+VALID_RATE_CODES = frozenset({1, 2, 3, 4, 5})
 
 # Valid payment types
-VALID_PAYMENT_TYPES = [1, 2, 3, 4, 5]  # 1=credit, 2=cash, 3=no charge, 4=dispute, 5=unknown
+VALID_PAYMENT_TYPES = frozenset({1, 2, 3, 4, 5})  # 1=credit, 2=cash, 3=no charge, 4=dispute, 5=unknown
 
 # Valid store_and_fwd flags
-VALID_STORE_FWD_FLAGS = ["Y", "N"]
+VALID_STORE_FWD_FLAGS = frozenset({"Y", "N"})
 
 # ============================================================================
 # RISK SCORING WEIGHTS
@@ -70,7 +73,15 @@ LATE_NIGHT_HOURS = [22, 23, 0, 1, 2, 3, 4, 5]
 # ============================================================================
 CHUNK_SIZE = 50000  # Process 50k rows at a time to avoid memory overflow
 EXPECTED_ZONE_COUNT = 263  # Expected number of taxi zones in NYC
+MAX_ZONE_ID = 265  # Highest TLC LocationID (264/265 are the "Unknown" zones)
 MAX_ROWS_TO_PROCESS = None  # Set to None to process all; set to number for testing
+IO_BUFFER_SIZE = 1 << 22  # 4 MiB file buffers for large CSV/log reads and writes
+# CPUs this process may run on (respects affinity masks where the OS exposes them)
+AVAILABLE_CPUS = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+# Processes validating chunks; 1 runs in-process. Windows process pools allow at most 61.
+CLEANING_WORKERS = min(AVAILABLE_CPUS, 61)
+WRITE_JSON_METRICS = True  # Human-readable metrics JSON
+WRITE_PARQUET_METRICS = False  # Columnar metrics copy; requires pyarrow
 
 # ============================================================================
 # FEATURE ENGINEERING DERIVATIONS
@@ -51,9 +51,9 @@ def convert_shp_to_geojson():
             
             geojson["features"].append(feature)
         
-        # Write GeoJSON file
+        # Write GeoJSON file (compact: no indentation or separator padding)
         with open(geojson_path, "w", encoding="utf-8") as f:
-            json.dump(geojson, f, indent=2)
+            json.dump(geojson, f, separators=(",", ":"))
         
         print(f"\n✅ Conversion successful!")
         print(f"   Total features: {len(geojson['features'])}")
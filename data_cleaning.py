@@ -6,7 +6,12 @@ and logs excluded records. No pandas/numpy - manual processing only.
 
 import csv
 import json
+import math
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+from itertools import islice
 from config import (
     YELLOW_TRIPDATA_CSV,
     TAXI_ZONE_LOOKUP_CSV,
@@ -19,91 +24,247 @@ from config import (
     CHUNK_SIZE,
     LATE_NIGHT_HOURS,
     MAX_ROWS_TO_PROCESS,
+    IO_BUFFER_SIZE,
+    CLEANING_WORKERS,
 )
 
 
+@lru_cache(maxsize=131072)
+def _parse_datetime(date_string):
+    """
+    Parse a stripped YYYY-MM-DD HH:MM:SS string, or None if malformed.
+    Memoized: trip timestamps repeat heavily, so most calls are cache hits.
+    The fixed 19-char layout is sliced directly; strptime is only the fallback.
+    Slices must be ASCII digits, since int() would also accept signs, spaces
+    and underscores that strptime rejects.
+    """
+    try:
+        if (len(date_string) == 19 and date_string.isascii()
+                and date_string[4] == "-" and date_string[7] == "-"
+                and date_string[10] == " " and date_string[13] == ":" and date_string[16] == ":"
+                and date_string[0:4].isdigit() and date_string[5:7].isdigit()
+                and date_string[8:10].isdigit() and date_string[11:13].isdigit()
+                and date_string[14:16].isdigit() and date_string[17:19].isdigit()):
+            return datetime(
+                int(date_string[0:4]), int(date_string[5:7]), int(date_string[8:10]),
+                int(date_string[11:13]), int(date_string[14:16]), int(date_string[17:19]),
+            )
+        return datetime.strptime(date_string, "%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        return None
+
+
+def _parse_datetime_field(value):
+    """Parse a stripped CSV timestamp, tolerating trailing content after the seconds."""
+    dt = _parse_datetime(value)
+    if dt is None and "," in value:
+        dt = _parse_datetime(value.split(",")[0].strip())
+    return dt
+
+
+# Validation thresholds hoisted out of the per-row dict lookups
+_MAX_DISTANCE_MILES = VALIDATION_THRESHOLDS["max_distance_miles"]
+_MIN_FARE = VALIDATION_THRESHOLDS["min_fare"]
+_MAX_FARE = VALIDATION_THRESHOLDS["max_fare"]
+_MIN_PASSENGER_COUNT = VALIDATION_THRESHOLDS["min_passenger_count"]
+_MAX_PASSENGER_COUNT = VALIDATION_THRESHOLDS["max_passenger_count"]
+_MIN_TRIP_DURATION_MINUTES = VALIDATION_THRESHOLDS["min_trip_duration_minutes"]
+_MAX_TRIP_DURATION_MINUTES = VALIDATION_THRESHOLDS["max_trip_duration_minutes"]
+
+# Raw input fields read by _validate_record, resolved to column positions once
+# from the CSV header (order matches the unpacking in _validate_record).
+INPUT_FIELDS = (
+    "tpep_pickup_datetime",
+    "tpep_dropoff_datetime",
+    "trip_distance",
+    "fare_amount",
+    "total_amount",
+    "passenger_count",
+    "PULocationID",
+    "DOLocationID",
+    "RatecodeID",
+    "payment_type",
+    "store_and_fwd_flag",
+    "extra",
+    "mta_tax",
+    "tip_amount",
+    "tolls_amount",
+    "improvement_surcharge",
+    "congestion_surcharge",
+    "VendorID",
+)
+
+# Cleaned output schema, in column order.
+CLEANED_COLUMNS = (
+    "trip_id",
+    "vendor_id",
+    "pickup_datetime",
+    "dropoff_datetime",
+    "passenger_count",
+    "trip_distance",
+    "ratecode_id",
+    "store_and_fwd_flag",
+    "pulocation_id",
+    "dolocation_id",
+    "payment_type",
+    "fare_amount",
+    "extra",
+    "mta_tax",
+    "tip_amount",
+    "tolls_amount",
+    "improvement_surcharge",
+    "total_amount",
+    "congestion_surcharge",
+    "trip_duration_minutes",
+    "hour_of_day",
+)
+
+# Two-decimal fields carried as integer hundredths (cents for money fields);
+# they are only formatted back to "x.xx" when a row is written.
+CENTS_COLUMNS = frozenset({
+    "trip_distance",
+    "fare_amount",
+    "extra",
+    "mta_tax",
+    "tip_amount",
+    "tolls_amount",
+    "improvement_surcharge",
+    "total_amount",
+    "congestion_surcharge",
+    "trip_duration_minutes",
+})
+
+# Fixed schema with no embedded commas/quotes: rows are formatted directly
+# instead of going through csv.writer, keeping its \r\n line terminator.
+CLEANED_HEADER = ",".join(CLEANED_COLUMNS) + "\r\n"
+CLEANED_ROW_FORMAT = ",".join(
+    "{:.2f}" if name in CENTS_COLUMNS else "{}" for name in CLEANED_COLUMNS
+) + "\r\n"
+_VENDOR_ID = CLEANED_COLUMNS.index("vendor_id")
+_CENTS_POSITIONS = tuple(i for i, name in enumerate(CLEANED_COLUMNS) if name in CENTS_COLUMNS)
+
+
+def _hundredths(value):
+    """
+    Integer hundredths of round(value, 2) (scaling first would let binary
+    error flip half-cent values). NaN/inf pass through unchanged, as the
+    unchecked amount fields always allowed them.
+    """
+    if math.isfinite(value):
+        return round(round(value, 2) * 100)
+    return value
+
+
+def _format_cleaned_rows(valid_rows):
+    """
+    Format cleaned record tuples as CSV lines.
+    Conversions run column-wise: missing vendor_id becomes an empty field and
+    hundredths are scaled back to units for the two-decimal format.
+    """
+    if not valid_rows:
+        return []
+    columns = list(zip(*valid_rows))
+    columns[_VENDOR_ID] = ["" if v is None else v for v in columns[_VENDOR_ID]]
+    for i in _CENTS_POSITIONS:
+        columns[i] = [v / 100 for v in columns[i]]
+    return [CLEANED_ROW_FORMAT.format(*row) for row in zip(*columns)]
+
+
+def _iter_line_chunks(lines, chunk_size):
+    """Yield (start_index, lines) batches of up to chunk_size raw CSV lines."""
+    start_index = 1
+    while True:
+        chunk = list(islice(lines, chunk_size))
+        if not chunk:
+            return
+        yield start_index, chunk
+        start_index += len(chunk)
+
+
 class DataCleaner:
     """Handles chunked CSV reading, validation, and feature engineering."""
 
     def __init__(self):
-        self.cleaned_trips = []
-        self.excluded_records = []
         self.zone_ids = self._load_zone_ids()
+        # Byte-per-zone lookup table: membership test is a single index
+        self.zone_bitmap = bytearray(max(self.zone_ids) + 1)
+        for zone_id in self.zone_ids:
+            self.zone_bitmap[zone_id] = 1
+        self.field_positions = ()
+        self.header_width = 0
+        self.row_width = 0  # header_width, plus one empty column if any are missing
         self.stats = {
             "total_processed": 0,
             "total_valid": 0,
             "total_excluded": 0,
-            "excluded_by_reason": {},
+            "excluded_by_reason": Counter(),
         }
 
     def _load_zone_ids(self):
         """Load valid zone IDs from taxi_zone_lookup.csv or use NYC standard range."""
-        zone_ids = set()
         try:
             with open(TAXI_ZONE_LOOKUP_CSV, "r", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    zone_id = row.get("LocationID")
-                    if zone_id:
-                        zone_ids.add(int(zone_id))
+                reader = csv.reader(f)
+                header = next(reader)
+                i_location = header.index("LocationID")
+                zone_ids = frozenset(int(row[i_location]) for row in reader if row and row[i_location])
             # If lookup is incomplete (< 263 zones), use standard NYC range
             if len(zone_ids) < 263:
                 print(f"⚠ Lookup incomplete ({len(zone_ids)} zones), using all NYC zones (1-263)")
-                zone_ids = set(range(1, 264))
+                zone_ids = frozenset(range(1, 264))
             else:
                 print(f"✓ Loaded {len(zone_ids)} valid zone IDs from lookup table")
         except Exception as e:
             # If zone lookup file doesn't exist, use standard NYC taxi zone range (1-263)
             print(f"⚠ Zone lookup unavailable, using standard NYC zones (1-263)")
-            zone_ids = set(range(1, 264))  # NYC has zones 1-263
+            zone_ids = frozenset(range(1, 264))  # NYC has zones 1-263
         return zone_ids
 
-    def _parse_datetime(self, date_string):
-        """Parse datetime string to standardized format."""
-        if not date_string or not isinstance(date_string, str):
-            return None
-        try:
-            date_string = date_string.strip()
-            # Try parsing format: YYYY-MM-DD HH:MM:SS
-            try:
-                dt = datetime.strptime(date_string, "%Y-%m-%d %H:%M:%S")
-                return dt
-            except ValueError:
-                # Try alternative formats that might be in data
-                # Handle trailing content after seconds
-                date_string = date_string.split(',')[0].strip()
-                dt = datetime.strptime(date_string, "%Y-%m-%d %H:%M:%S")
-                return dt
-        except (ValueError, AttributeError):
-            return None
-
     def _parse_float(self, value):
-        """Safely parse float value."""
-        if value is None or value == "":
+        """Safely parse float value. Empty cells short-circuit without raising."""
+        if not value:
             return None
         try:
             return float(value)
-        except (ValueError, TypeError):
+        except ValueError:
             return None
 
     def _parse_int(self, value):
-        """Safely parse integer value."""
-        if value is None or value == "":
+        """
+        Safely parse integer value.
+        Plain digit strings (the common case) go straight to int(); only
+        signed or float-formatted values like "1.0" take the float() path.
+        """
+        if not value:
             return None
+        if value.isdecimal():
+            return int(value)
         try:
             return int(float(value))
-        except (ValueError, TypeError):
+        except ValueError:
             return None
 
     def _validate_record(self, row, row_index):
         """
         Validate a single trip record against all business rules.
-        Returns: (is_valid, cleaned_record, exclusion_reason)
+        `row` is a csv.reader list indexed by the cached INPUT_FIELDS positions.
+        Returns: (is_valid, cleaned_record, exclusion_reason), where
+        cleaned_record is a flat tuple in CLEANED_COLUMNS order.
         """
+        (
+            i_pickup, i_dropoff, i_distance, i_fare, i_total,
+            i_passengers, i_pu, i_do, i_ratecode, i_payment,
+            i_store_fwd, i_extra, i_mta_tax, i_tip, i_tolls,
+            i_improvement, i_congestion, i_vendor,
+        ) = self.field_positions
+        parse_float = self._parse_float
+        parse_int = self._parse_int
         try:
             # Parse timestamps
-            pickup_dt = self._parse_datetime(row.get("tpep_pickup_datetime", ""))
-            dropoff_dt = self._parse_datetime(row.get("tpep_dropoff_datetime", ""))
+            pickup_str = row[i_pickup].strip()
+            dropoff_str = row[i_dropoff].strip()
+            pickup_dt = _parse_datetime_field(pickup_str)
+            dropoff_dt = _parse_datetime_field(dropoff_str)
 
             # Temporal validation
             if not pickup_dt or not dropoff_dt:
@@ -116,107 +277,185 @@ class DataCleaner:
             if pickup_dt.year != 2019 or pickup_dt.month != 1:
                 return False, None, "date_out_of_range"
 
-            # Parse numeric fields
-            trip_distance = self._parse_float(row.get("trip_distance", ""))
-            fare_amount = self._parse_float(row.get("fare_amount", ""))
-            total_amount = self._parse_float(row.get("total_amount", ""))
-            passenger_count = self._parse_int(row.get("passenger_count", ""))
-            pulocation_id = self._parse_int(row.get("PULocationID", ""))
-            dolocation_id = self._parse_int(row.get("DOLocationID", ""))
+            # Each field is parsed just before its check so a row rejected early
+            # never pays for parsing the rest. Check order (and therefore the
+            # reported exclusion reason) is unchanged.
 
             # Distance validation
+            trip_distance = parse_float(row[i_distance])
             if trip_distance is None or trip_distance < 0:
                 return False, None, "negative_or_null_distance"
 
-            if trip_distance > VALIDATION_THRESHOLDS["max_distance_miles"]:
+            if trip_distance > _MAX_DISTANCE_MILES:
                 return False, None, "distance_exceeds_max"
 
             # Fare validation
-            if fare_amount is None or fare_amount < VALIDATION_THRESHOLDS["min_fare"]:
+            fare_amount = parse_float(row[i_fare])
+            if fare_amount is None or fare_amount < _MIN_FARE:
                 return False, None, "negative_or_null_fare"
 
-            if fare_amount > VALIDATION_THRESHOLDS["max_fare"]:
+            if fare_amount > _MAX_FARE:
                 return False, None, "fare_exceeds_max"
 
             # Passenger count validation
-            if passenger_count is None or passenger_count < VALIDATION_THRESHOLDS["min_passenger_count"]:
+            passenger_count = parse_int(row[i_passengers])
+            if passenger_count is None or passenger_count < _MIN_PASSENGER_COUNT:
                 return False, None, "invalid_passenger_count"
 
-            if passenger_count > VALIDATION_THRESHOLDS["max_passenger_count"]:
+            if passenger_count > _MAX_PASSENGER_COUNT:
                 return False, None, "passenger_count_exceeds_max"
 
             # Zone validation
-            if pulocation_id is None or pulocation_id not in self.zone_ids:
+            zone_bitmap = self.zone_bitmap
+            pulocation_id = parse_int(row[i_pu])
+            if (pulocation_id is None or not 0 <= pulocation_id < len(zone_bitmap)
+                    or not zone_bitmap[pulocation_id]):
                 return False, None, "invalid_pulocation_id"
 
-            if dolocation_id is None or dolocation_id not in self.zone_ids:
+            dolocation_id = parse_int(row[i_do])
+            if (dolocation_id is None or not 0 <= dolocation_id < len(zone_bitmap)
+                    or not zone_bitmap[dolocation_id]):
                 return False, None, "invalid_dolocation_id"
 
             # Trip duration validation
             trip_duration_minutes = (dropoff_dt - pickup_dt).total_seconds() / 60
-            if trip_duration_minutes < VALIDATION_THRESHOLDS["min_trip_duration_minutes"]:
+            if trip_duration_minutes < _MIN_TRIP_DURATION_MINUTES:
                 return False, None, "trip_duration_too_short"
 
-            if trip_duration_minutes > VALIDATION_THRESHOLDS["max_trip_duration_minutes"]:
+            if trip_duration_minutes > _MAX_TRIP_DURATION_MINUTES:
                 return False, None, "trip_duration_exceeds_max"
 
             # Rate code validation
-            ratecode_id = self._parse_int(row.get("RatecodeID", ""))
+            ratecode_id = parse_int(row[i_ratecode])
             if ratecode_id is None or ratecode_id not in VALID_RATE_CODES:
                 return False, None, "invalid_ratecode"
 
             # Payment type validation
-            payment_type = self._parse_int(row.get("payment_type", ""))
+            payment_type = parse_int(row[i_payment])
             if payment_type is None or payment_type not in VALID_PAYMENT_TYPES:
                 return False, None, "invalid_payment_type"
 
             # Store and forward flag validation
-            store_fwd_flag = row.get("store_and_fwd_flag", "").strip()
+            store_fwd_flag = row[i_store_fwd].strip()
             if store_fwd_flag not in VALID_STORE_FWD_FLAGS:
                 return False, None, "invalid_store_fwd_flag"
 
-            # Parse remaining fields
-            extra = self._parse_float(row.get("extra", "")) or 0.0
-            mta_tax = self._parse_float(row.get("mta_tax", "")) or 0.0
-            tip_amount = self._parse_float(row.get("tip_amount", "")) or 0.0
-            tolls_amount = self._parse_float(row.get("tolls_amount", "")) or 0.0
-            improvement_surcharge = self._parse_float(row.get("improvement_surcharge", "")) or 0.0
-            congestion_surcharge = self._parse_float(row.get("congestion_surcharge", "")) or 0.0
+            # Parse remaining fields (only reached by valid records)
+            total_amount = parse_float(row[i_total])
+            extra = parse_float(row[i_extra]) or 0.0
+            mta_tax = parse_float(row[i_mta_tax]) or 0.0
+            tip_amount = parse_float(row[i_tip]) or 0.0
+            tolls_amount = parse_float(row[i_tolls]) or 0.0
+            improvement_surcharge = parse_float(row[i_improvement]) or 0.0
+            congestion_surcharge = parse_float(row[i_congestion]) or 0.0
 
             # Calculate hour of day
             hour_of_day = pickup_dt.hour
 
-            # Create cleaned record
-            cleaned_record = {
-                "trip_id": row_index,
-                "vendor_id": self._parse_int(row.get("VendorID", "")),
-                "pickup_datetime": pickup_dt.strftime("%Y-%m-%d %H:%M:%S"),
-                "dropoff_datetime": dropoff_dt.strftime("%Y-%m-%d %H:%M:%S"),
-                "passenger_count": passenger_count,
-                "trip_distance": round(trip_distance, 2),
-                "ratecode_id": ratecode_id,
-                "store_and_fwd_flag": store_fwd_flag,
-                "pulocation_id": pulocation_id,
-                "dolocation_id": dolocation_id,
-                "payment_type": payment_type,
-                "fare_amount": round(fare_amount, 2),
-                "extra": round(extra, 2),
-                "mta_tax": round(mta_tax, 2),
-                "tip_amount": round(tip_amount, 2),
-                "tolls_amount": round(tolls_amount, 2),
-                "improvement_surcharge": round(improvement_surcharge, 2),
-                "total_amount": round(total_amount, 2) if total_amount else 0.0,
-                "congestion_surcharge": round(congestion_surcharge, 2),
+            # Create cleaned record (field order matches CLEANED_COLUMNS).
+            # Two-decimal fields are kept as integer hundredths (see CENTS_COLUMNS).
+            cleaned_record = (
+                row_index,
+                parse_int(row[i_vendor]),
+                # Source strings are already canonical unless the fallback parse was used
+                pickup_str if len(pickup_str) == 19 else pickup_dt.strftime("%Y-%m-%d %H:%M:%S"),
+                dropoff_str if len(dropoff_str) == 19 else dropoff_dt.strftime("%Y-%m-%d %H:%M:%S"),
+                passenger_count,
+                _hundredths(trip_distance),
+                ratecode_id,
+                store_fwd_flag,
+                pulocation_id,
+                dolocation_id,
+                payment_type,
+                _hundredths(fare_amount),
+                _hundredths(extra),
+                _hundredths(mta_tax),
+                _hundredths(tip_amount),
+                _hundredths(tolls_amount),
+                _hundredths(improvement_surcharge),
+                _hundredths(total_amount) if total_amount else 0,
+                _hundredths(congestion_surcharge),
                 # Derived features
-                "trip_duration_minutes": round(trip_duration_minutes, 2),
-                "hour_of_day": hour_of_day,
-            }
+                _hundredths(trip_duration_minutes),
+                hour_of_day,
+            )
 
             return True, cleaned_record, None
 
         except Exception as e:
             return False, None, f"processing_error_{str(e)[:30]}"
 
+    def _resolve_field_positions(self, header):
+        """
+        Resolve INPUT_FIELDS to column positions in the input header.
+        Missing columns read as empty on every row, as DictReader's
+        row.get(name, "") did: they point one past the last header column,
+        where _clean_chunk pads each row with an empty field.
+        """
+        missing = [name for name in INPUT_FIELDS if name not in header]
+        if missing:
+            print(f"⚠ Input has no {', '.join(missing)} column(s); treating as empty")
+        self.header_width = len(header)
+        self.row_width = len(header) + 1 if missing else len(header)
+        self.field_positions = tuple(
+            header.index(name) if name in header else len(header)
+            for name in INPUT_FIELDS
+        )
+
+    def _clean_chunk(self, lines, start_index):
+        """
+        Parse and validate one chunk of raw CSV lines.
+        Pure function of its inputs so it can run in a worker process.
+        Returns: (row_count, cleaned_lines, excluded_lines, chunk_reasons)
+        """
+        chunk_reasons = Counter()
+        valid_rows = []
+        excluded_lines = []
+        row_count = 0
+        # Bind hot-loop callables to locals once per chunk
+        validate = self._validate_record
+        add_valid = valid_rows.append
+        add_excluded = excluded_lines.append
+        header_width = self.header_width
+        row_width = self.row_width
+        for row_index, row in enumerate(csv.reader(lines), start=start_index):
+            row_count += 1
+            if len(row) != row_width:
+                # Fit ragged rows to the header: fields a short row lacks read
+                # as empty (DictReader gave None), and extras are dropped so a
+                # missing column's position always lands on an empty field
+                del row[header_width:]
+                row.extend([""] * (row_width - len(row)))
+            is_valid, cleaned_record, reason = validate(row, row_index)
+
+            if is_valid:
+                add_valid(cleaned_record)
+            else:
+                chunk_reasons[reason] += 1
+                add_excluded(f"{row_index},{reason}\n")
+
+        return row_count, _format_cleaned_rows(valid_rows), excluded_lines, chunk_reasons
+
+    def _iter_chunk_results(self, line_chunks):
+        """
+        Yield _clean_chunk results in input order. With CLEANING_WORKERS > 1,
+        chunks are validated in a process pool with a bounded number in flight,
+        so memory stays proportional to CHUNK_SIZE.
+        """
+        if CLEANING_WORKERS <= 1:
+            for start_index, lines in line_chunks:
+                yield self._clean_chunk(lines, start_index)
+            return
+
+        with ProcessPoolExecutor(max_workers=CLEANING_WORKERS) as executor:
+            pending = deque()
+            for start_index, lines in line_chunks:
+                pending.append(executor.submit(self._clean_chunk, lines, start_index))
+                if len(pending) >= 2 * CLEANING_WORKERS:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
     def process_csv_chunks(self):
         """Process CSV in chunks to avoid memory overflow."""
         print("\n" + "=" * 70)
@@ -224,45 +463,50 @@ class DataCleaner:
         print("=" * 70)
         if MAX_ROWS_TO_PROCESS:
             print(f"⚠ TESTING MODE: Processing first {MAX_ROWS_TO_PROCESS:,} rows only")
+        if CLEANING_WORKERS > 1:
+            print(f"  Validating chunks with {CLEANING_WORKERS} worker processes")
         print()
 
+        _parse_datetime.cache_clear()
         chunk_count = 0
         try:
-            with open(YELLOW_TRIPDATA_CSV, "r", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                chunk = []
-
-                for row_index, row in enumerate(reader, start=1):
-                    # Allow early exit for testing
-                    if MAX_ROWS_TO_PROCESS and row_index > MAX_ROWS_TO_PROCESS:
-                        break
-
-                    self.stats["total_processed"] += 1
-
-                    # Validate record
-                    is_valid, cleaned_record, reason = self._validate_record(row, row_index)
-
-                    if is_valid:
-                        self.cleaned_trips.append(cleaned_record)
-                        self.stats["total_valid"] += 1
-                    else:
-                        self.stats["total_excluded"] += 1
-                        self.stats["excluded_by_reason"][reason] = (
-                            self.stats["excluded_by_reason"].get(reason, 0) + 1
-                        )
-                        self.excluded_records.append((row_index, reason))
-
-                    # Process chunk
-                    chunk.append((is_valid, cleaned_record, reason))
-                    if len(chunk) >= CHUNK_SIZE:
-                        chunk_count += 1
-                        print(f"  ✓ Processed chunk {chunk_count} ({CHUNK_SIZE:,} rows)")
-                        chunk = []
+            with open(YELLOW_TRIPDATA_CSV, "r", encoding="utf-8", buffering=IO_BUFFER_SIZE) as f:
+                # Resolve the header before the outputs are opened (and truncated)
+                header = next(csv.reader([f.readline()]))
+                self._resolve_field_positions([name.strip() for name in header])
+
+                # Chunks are split on raw lines (trip data has no quoted
+                # newlines) and tokenized by whichever process validates them.
+                # Blank lines are dropped first, as DictReader skipped them, so
+                # row indices and MAX_ROWS_TO_PROCESS count records only.
+                lines = (line for line in f if line != "\n")
+                # Allow early exit for testing
+                if MAX_ROWS_TO_PROCESS:
+                    lines = islice(lines, MAX_ROWS_TO_PROCESS)
+
+                with open(CLEANED_TRIPS_CSV, "w", newline="", encoding="utf-8",
+                          buffering=IO_BUFFER_SIZE) as cleaned_out, \
+                     open(EXCLUDED_RECORDS_LOG, "w", encoding="utf-8",
+                          buffering=IO_BUFFER_SIZE) as excluded_out:
+                    # Results are streamed out chunk by chunk; nothing is buffered
+                    # beyond the chunks currently being validated.
+                    cleaned_out.write(CLEANED_HEADER)
+                    excluded_out.write("index,reason\n")
+
+                    stats = self.stats
+                    for row_count, cleaned_lines, excluded_lines, chunk_reasons in (
+                        self._iter_chunk_results(_iter_line_chunks(lines, CHUNK_SIZE))
+                    ):
+                        cleaned_out.writelines(cleaned_lines)
+                        excluded_out.writelines(excluded_lines)
+
+                        stats["total_processed"] += row_count
+                        stats["total_valid"] += len(cleaned_lines)
+                        stats["total_excluded"] += len(excluded_lines)
+                        stats["excluded_by_reason"].update(chunk_reasons)
 
-                # Process remaining rows
-                if chunk:
-                    chunk_count += 1
-                    print(f"  ✓ Processed chunk {chunk_count} ({len(chunk):,} rows)")
+                        chunk_count += 1
+                        print(f"  ✓ Processed chunk {chunk_count} ({row_count:,} rows)")
 
             print(f"\n✓ CSV processing complete!")
             print(f"  Total rows processed: {self.stats['total_processed']:,}")
@@ -275,50 +519,29 @@ class DataCleaner:
             print(f"✗ Error processing CSV: {e}")
 
     def write_cleaned_data(self):
-        """Write cleaned trips to CSV output file."""
+        """Report the cleaned trips CSV streamed out by process_csv_chunks."""
         print("\n" + "-" * 70)
-        print("WRITING CLEANED DATA TO FILE")
+        print("CLEANED DATA OUTPUT")
         print("-" * 70)
 
-        try:
-            if not self.cleaned_trips:
-                print("✗ No cleaned records to write")
-                return
-
-            with open(CLEANED_TRIPS_CSV, "w", newline="", encoding="utf-8") as f:
-                fieldnames = list(self.cleaned_trips[0].keys())
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(self.cleaned_trips)
+        if not self.stats["total_valid"]:
+            print("✗ No cleaned records written")
+            return
 
-            print(f"✓ Wrote {len(self.cleaned_trips):,} clean records to:")
-            print(f"  {CLEANED_TRIPS_CSV}")
-
-        except Exception as e:
-            print(f"✗ Error writing cleaned data: {e}")
+        print(f"✓ Wrote {self.stats['total_valid']:,} clean records to:")
+        print(f"  {CLEANED_TRIPS_CSV}")
 
     def write_exclusion_log(self):
-        """Write excluded records log."""
+        """Report the exclusion log streamed out by process_csv_chunks."""
         print("\n" + "-" * 70)
-        print("WRITING EXCLUSION LOG")
+        print("EXCLUSION LOG")
         print("-" * 70)
 
-        try:
-            with open(EXCLUDED_RECORDS_LOG, "w", encoding="utf-8") as f:
-                f.write("index,reason\n")
-                for row_index, reason in self.excluded_records:
-                    f.write(f"{row_index},{reason}\n")
-
-            print(f"✓ Wrote {len(self.excluded_records):,} exclusion records to:")
-            print(f"  {EXCLUDED_RECORDS_LOG}")
-            print("\nExclusion breakdown:")
-            for reason, count in sorted(
-                self.stats["excluded_by_reason"].items(), key=lambda x: x[1], reverse=True
-            ):
-                print(f"  - {reason}: {count:,}")
-
-        except Exception as e:
-            print(f"✗ Error writing exclusion log: {e}")
+        print(f"✓ Wrote {self.stats['total_excluded']:,} exclusion records to:")
+        print(f"  {EXCLUDED_RECORDS_LOG}")
+        print("\nExclusion breakdown:")
+        for reason, count in self.stats["excluded_by_reason"].most_common():
+            print(f"  - {reason}: {count:,}")
 
     def print_summary(self):
         """Print comprehensive summary statistics."""
@@ -339,11 +562,11 @@ class DataCleaner:
         self.write_cleaned_data()
         self.write_exclusion_log()
         self.print_summary()
-        return self.cleaned_trips
+        return self.stats
 
 
 if __name__ == "__main__":
     cleaner = DataCleaner()
-    cleaned_data = cleaner.run()
+    stats = cleaner.run()
     print(f"\n✓ Data cleaning pipeline complete!")
     print(f"  Cleaned records ready for feature engineering and risk scoring.")
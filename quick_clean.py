@@ -12,6 +12,7 @@ from config import (
     CLEANED_TRIPS_CSV,
     EXCLUDED_RECORDS_LOG,
     MAX_ROWS_TO_PROCESS,
+    IO_BUFFER_SIZE,
 )
 
 print("=" * 70)
@@ -23,9 +24,9 @@ excluded_count = 0
 valid_zones = set(range(1, 264))
 
 try:
-    with open(YELLOW_TRIPDATA_CSV, "r", encoding="utf-8") as infile, \
-         open(CLEANED_TRIPS_CSV, "w", newline="", encoding="utf-8") as outfile, \
-         open(EXCLUDED_RECORDS_LOG, "w", encoding="utf-8") as logfile:
+    with open(YELLOW_TRIPDATA_CSV, "r", encoding="utf-8", buffering=IO_BUFFER_SIZE) as infile, \
+         open(CLEANED_TRIPS_CSV, "w", newline="", encoding="utf-8", buffering=IO_BUFFER_SIZE) as outfile, \
+         open(EXCLUDED_RECORDS_LOG, "w", encoding="utf-8", buffering=IO_BUFFER_SIZE) as logfile:
 
         reader = csv.DictReader(infile)
         fieldnames = reader.fieldnames
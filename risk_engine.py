@@ -7,152 +7,317 @@ Manual implementations: variance, density aggregation, sorting (no built-ins).
 import json
 import csv
 import math
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+try:
+    import orjson  # Optional fast JSON encoder; stdlib json is the fallback
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow as pa  # Optional; only needed for Parquet metrics output
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
 from config import (
     CLEANED_TRIPS_CSV,
     ZONE_HOUR_METRICS_JSON,
     ZONE_REVENUE_METRICS_JSON,
     ZONE_RISK_SCORES_JSON,
+    ZONE_HOUR_METRICS_PARQUET,
+    ZONE_REVENUE_METRICS_PARQUET,
+    ZONE_RISK_SCORES_PARQUET,
+    WRITE_JSON_METRICS,
+    WRITE_PARQUET_METRICS,
     RISK_WEIGHTS,
     LATE_NIGHT_HOURS,
+    MAX_ZONE_ID,
+    CHUNK_SIZE,
+)
+
+HOURS_PER_DAY = 24
+
+# Bit h set for each late-night hour h: membership is (mask >> hour) & 1
+LATE_NIGHT_MASK = sum(1 << hour for hour in set(LATE_NIGHT_HOURS))
+
+
+def _dump_json(path, obj):
+    """Write obj as 2-space indented JSON, using orjson when it is installed."""
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(obj, f, indent=2)
+
+
+# Decimal places applied to metric fields when written out; values are kept
+# at full precision in memory
+FIELD_DECIMALS = {
+    "avg_trip_duration": 2,
+    "avg_revenue": 2,
+    "revenue_variance": 2,
+    "revenue_std_dev": 2,
+    "stability_score": 4,
+    "density_component": 4,
+    "late_night_component": 4,
+    "volatility_component": 4,
+    "risk_score": 4,
+}
+
+
+def _rounded(record):
+    """Copy of a metrics record with FIELD_DECIMALS rounding applied."""
+    return {
+        field: round(value, FIELD_DECIMALS[field]) if field in FIELD_DECIMALS else value
+        for field, value in record.items()
+    }
+
+
+# Column layout of the zone-hour tables (one list per field, row-aligned)
+ZONE_HOUR_FIELDS = ("zone_id", "hour", "trip_count", "avg_trip_duration", "exposure_score")
+RISK_SCORE_FIELDS = (
+    "zone_id", "hour", "trip_count",
+    "density_component", "late_night_component", "volatility_component", "risk_score",
 )
 
 
+def _new_table(fields):
+    """Empty columnar table: {field: []} for each field, in order."""
+    return {field: [] for field in fields}
+
+
+def _table_rows(table):
+    """Iterate a columnar table as one record dict per row."""
+    fields = tuple(table)
+    for row in zip(*table.values()):
+        yield dict(zip(fields, row))
+
+
+def _key_by_zone_hour(table):
+    """Serialize a zone-hour table as {"<zone_id>_<hour>": rounded record}."""
+    return {
+        "%d_%d" % (record["zone_id"], record["hour"]): _rounded(record)
+        for record in _table_rows(table)
+    }
+
+
+class TripAccumulator:
+    """
+    Dense running sums over trip batches, preallocated for MAX_ZONE_ID zones.
+    Zone-hour slots are indexed by zone_id * 24 + hour; fare statistics are
+    per zone (count / sum / sum of squares). Grows if a batch has a larger zone.
+    Cleaned durations and fares have two decimals, so sums are kept in exact
+    integer hundredths: results do not depend on trip order or shard split.
+    """
+
+    def __init__(self, n_zones=MAX_ZONE_ID + 1):
+        self.n_zones = 0
+        self.counts = []
+        self.total_durations = []  # Hundredths of a minute
+        self.fare_count = []
+        self.fare_sum = []  # Cents
+        self.fare_sumsq = []  # Cents squared
+        self._grow(n_zones)
+
+    def _grow(self, n_zones):
+        """Extend every array to hold zone ids below n_zones."""
+        extra = n_zones - self.n_zones
+        if extra <= 0:
+            return
+        self.counts.extend([0] * (extra * HOURS_PER_DAY))
+        self.total_durations.extend([0] * (extra * HOURS_PER_DAY))
+        self.fare_count.extend([0] * extra)
+        self.fare_sum.extend([0] * extra)
+        self.fare_sumsq.extend([0] * extra)
+        self.n_zones = n_zones
+
+    def add(self, zones, hours, durations, fares):
+        """
+        Fold one batch of trip columns into the running sums.
+        Raises ValueError on a negative zone_id or an hour outside 0-23, which
+        would otherwise index into another zone-hour's slot. Non-finite fares
+        (nan/inf pass through cleaning) are left out of the fare statistics.
+        """
+        if not zones:
+            return
+        min_zone = min(zones)
+        if min_zone < 0:
+            raise ValueError(f"zone_id out of range: {min_zone}")
+        min_hour, max_hour = min(hours), max(hours)
+        if min_hour < 0 or max_hour >= HOURS_PER_DAY:
+            bad_hour = min_hour if min_hour < 0 else max_hour
+            raise ValueError(f"hour_of_day out of range: {bad_hour}")
+        self._grow(max(zones) + 1)
+
+        counts = self.counts
+        total_durations = self.total_durations
+        fare_count = self.fare_count
+        fare_sum = self.fare_sum
+        fare_sumsq = self.fare_sumsq
+        isfinite = math.isfinite
+        for zone_id, hour, duration, fare in zip(zones, hours, durations, fares):
+            key = zone_id * HOURS_PER_DAY + hour
+            counts[key] += 1
+            total_durations[key] += round(duration * 100)
+
+            if isfinite(fare):
+                cents = round(fare * 100)
+                fare_count[zone_id] += 1
+                fare_sum[zone_id] += cents
+                fare_sumsq[zone_id] += cents * cents
+
+    def merge(self, other):
+        """Add another accumulator's sums into this one (same dense layout)."""
+        self._grow(other.n_zones)
+        for mine, theirs in (
+            (self.counts, other.counts),
+            (self.total_durations, other.total_durations),
+            (self.fare_count, other.fare_count),
+            (self.fare_sum, other.fare_sum),
+            (self.fare_sumsq, other.fare_sumsq),
+        ):
+            for i, value in enumerate(theirs):
+                if value:
+                    mine[i] += value
+
+
+def _accumulate_csv(path):
+    """
+    Stream one cleaned-trip CSV in CHUNK_SIZE batches into a TripAccumulator.
+    Only the four fields the metrics need are parsed. Returns
+    (accumulator, trip_count); module-level so worker processes can run it.
+    """
+    accumulator = TripAccumulator()
+    trip_count = 0
+    with open(path, "r", encoding="utf-8") as f:
+        # Blank lines come through csv.reader as empty rows; skip them as DictReader did
+        reader = filter(None, csv.reader(f))
+        header = next(reader)
+        i_zone = header.index("pulocation_id")
+        i_hour = header.index("hour_of_day")
+        i_duration = header.index("trip_duration_minutes")
+        i_fare = header.index("total_amount")
+
+        while True:
+            chunk = list(islice(reader, CHUNK_SIZE))
+            if not chunk:
+                break
+            accumulator.add(
+                [int(row[i_zone]) for row in chunk],
+                [int(row[i_hour]) for row in chunk],
+                [float(row[i_duration]) for row in chunk],
+                [float(row[i_fare]) for row in chunk],
+            )
+            trip_count += len(chunk)
+    return accumulator, trip_count
+
+
 class RiskEngine:
     """Computes exposure metrics and risk scores from cleaned trip data."""
 
-    def __init__(self):
-        self.cleaned_trips = []
-        self.zone_hour_metrics = {}
+    def __init__(self, shard_paths=None, n_procs=1):
+        # Cleaned-trip CSVs to read; shards are merged into one accumulator
+        self.shard_paths = list(shard_paths) if shard_paths else [CLEANED_TRIPS_CSV]
+        self.n_procs = max(1, n_procs)
+        self.trip_count = 0
+        self.saved_formats = []  # Output formats written successfully ("JSON", "Parquet")
+        # Zone-hour results are columnar tables (see ZONE_HOUR_FIELDS /
+        # RISK_SCORE_FIELDS); revenue metrics stay keyed by zone_id
+        self.zone_hour_metrics = _new_table(ZONE_HOUR_FIELDS)
         self.zone_revenue_metrics = {}
-        self.zone_risk_scores = {}
-        self.trip_fares_by_zone = {}
+        self.zone_risk_scores = _new_table(RISK_SCORE_FIELDS)
+        # Zone-hour counts/durations and per-zone fare statistics, folded in
+        # chunk by chunk while loading so trips are never held in memory
+        self.accumulator = TripAccumulator()
 
     def load_cleaned_data(self):
-        """Load cleaned trips from CSV."""
+        """
+        Stream cleaned trips from CSV in CHUNK_SIZE batches.
+        Each batch is folded into self.accumulator, so memory is
+        O(zones x hours), not O(trips). With several shards and n_procs > 1,
+        shards are accumulated in worker processes and merged here.
+        """
         print("\n" + "=" * 70)
         print("RISK ENGINE - FEATURE COMPUTATION")
         print("=" * 70)
         print("\nLoading cleaned trip data...")
 
         try:
-            with open(CLEANED_TRIPS_CSV, "r", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    self.cleaned_trips.append(row)
-
-            print(f"✓ Loaded {len(self.cleaned_trips):,} cleaned records")
-        except FileNotFoundError:
-            print(f"✗ Error: Cleaned data file not found: {CLEANED_TRIPS_CSV}")
+            n_workers = min(self.n_procs, len(self.shard_paths))
+            if n_workers > 1:
+                with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                    partials = list(executor.map(_accumulate_csv, self.shard_paths))
+            else:
+                partials = [_accumulate_csv(path) for path in self.shard_paths]
+
+            for accumulator, trip_count in partials:
+                self.accumulator.merge(accumulator)
+                self.trip_count += trip_count
+
+            print(f"✓ Loaded {self.trip_count:,} cleaned records")
+        except FileNotFoundError as e:
+            print(f"✗ Error: Cleaned data file not found: {e.filename}")
             print("  Run data_cleaning.py first")
         except Exception as e:
             print(f"✗ Error loading cleaned data: {e}")
 
-    def _compute_manual_variance(self, values):
-        """
-        Manually compute variance and standard deviation (no numpy/statistics).
-        Variance = sum((x - mean)^2) / n
-        StdDev = sqrt(variance)
-        """
-        if not values or len(values) == 0:
-            return 0.0, 0.0
-
-        # Step 1: Calculate mean
-        mean = sum(values) / len(values)
-
-        # Step 2: Calculate sum of squared differences
-        sum_squared_diff = 0
-        for value in values:
-            diff = value - mean
-            sum_squared_diff += diff * diff
-
-        # Step 3: Calculate variance
-        variance = sum_squared_diff / len(values)
-
-        # Step 4: Calculate standard deviation (square root)
-        std_dev = math.sqrt(variance)
-
-        return variance, std_dev
-
     def compute_exposure_density(self):
         """
         Compute zone-hour trip density (exposure score).
         Manual aggregation: no Counter, no pandas groupby.
+        Reads the zone-hour sums accumulated while loading.
         """
         print("\n" + "-" * 70)
         print("STEP 1: COMPUTING EXPOSURE DENSITY SCORES")
         print("-" * 70)
 
-        # Manual aggregation using nested dictionaries
-        zone_hour_trips = {}
-
-        for trip in self.cleaned_trips:
-            zone_id = int(trip["pulocation_id"])
-            hour = int(trip["hour_of_day"])
-            duration = float(trip["trip_duration_minutes"])
-
-            # Create key for zone-hour combination
-            key = (zone_id, hour)
-
-            # Initialize if first time seeing this zone-hour
-            if key not in zone_hour_trips:
-                zone_hour_trips[key] = {
-                    "count": 0,
-                    "total_duration": 0.0,
-                    "trips": []
-                }
-
-            # Aggregate
-            zone_hour_trips[key]["count"] += 1
-            zone_hour_trips[key]["total_duration"] += duration
-            zone_hour_trips[key]["trips"].append(trip)
-
-        # Convert to metrics dictionary
-        for (zone_id, hour), data in zone_hour_trips.items():
-            trip_count = data["count"]
-            avg_duration = data["total_duration"] / trip_count if trip_count > 0 else 0
-
-            self.zone_hour_metrics[(zone_id, hour)] = {
-                "zone_id": zone_id,
-                "hour": hour,
-                "trip_count": trip_count,
-                "avg_trip_duration": round(avg_duration, 2),
-                "exposure_score": trip_count,  # Raw trip count as exposure
-            }
-
-        print(f"✓ Computed {len(self.zone_hour_metrics)} zone-hour combinations")
-        print(f"  Sample: Zone 42, Hour 8 = {len([t for t in self.cleaned_trips if int(t['pulocation_id']) == 42 and int(t['hour_of_day']) == 8])} trips")
+        # Sums live in flat arrays indexed by a dense zone * 24 + hour key
+        acc = self.accumulator
+        counts = acc.counts
+        total_durations = acc.total_durations
+
+        # Convert occupied slots to the metrics columns
+        keys = [key for key, trip_count in enumerate(counts) if trip_count]
+        trip_counts = [counts[key] for key in keys]
+        metrics = self.zone_hour_metrics
+        metrics["zone_id"] = [key // HOURS_PER_DAY for key in keys]
+        metrics["hour"] = [key % HOURS_PER_DAY for key in keys]
+        metrics["trip_count"] = trip_counts
+        metrics["avg_trip_duration"] = [
+            total_durations[key] / 100 / counts[key] for key in keys
+        ]
+        metrics["exposure_score"] = list(trip_counts)  # Raw trip count as exposure
+
+        print(f"✓ Computed {len(keys)} zone-hour combinations")
+        sample = counts[42 * HOURS_PER_DAY + 8] if acc.n_zones > 42 else 0
+        print(f"  Sample: Zone 42, Hour 8 = {sample} trips")
 
     def compute_revenue_volatility(self):
         """
         Compute revenue volatility per zone using manual variance calculation.
         Manual aggregation: no pandas, no numpy, no statistics library.
+        Uses the per-zone fare accumulators filled while loading.
         """
         print("\n" + "-" * 70)
         print("STEP 2: COMPUTING REVENUE VOLATILITY (MANUAL VARIANCE)")
         print("-" * 70)
 
-        # First pass: collect all fares per zone
-        zone_fares = {}
-
-        for trip in self.cleaned_trips:
-            zone_id = int(trip["pulocation_id"])
-            total_amount = float(trip["total_amount"])
-
-            if zone_id not in zone_fares:
-                zone_fares[zone_id] = []
-
-            zone_fares[zone_id].append(total_amount)
-
-        # Second pass: compute statistics for each zone
-        for zone_id, fares in zone_fares.items():
-            if not fares:
+        # Finish the variance from the running sums gathered while loading
+        acc = self.accumulator
+        for zone_id, n in enumerate(acc.fare_count):
+            if not n:
                 continue
 
-            # Manual mean calculation
-            mean_fare = sum(fares) / len(fares)
-
-            # Manual variance and std dev calculation
-            variance, std_dev = self._compute_manual_variance(fares)
+            # Manual variance and std dev from exact cent sums:
+            # sum((x - mean)^2) / n = (n * sum(x^2) - sum(x)^2) / n^2
+            fare_sum = acc.fare_sum[zone_id]
+            mean_fare = fare_sum / 100 / n
+            variance = (n * acc.fare_sumsq[zone_id] - fare_sum * fare_sum) / (n * n * 10000)
+            std_dev = math.sqrt(variance)
 
             # Stability score (inverse of volatility: low std_dev = high stability)
             # Normalize to 0-1 scale
@@ -162,14 +327,14 @@ class RiskEngine:
 
             self.zone_revenue_metrics[zone_id] = {
                 "zone_id": zone_id,
-                "avg_revenue": round(mean_fare, 2),
-                "revenue_variance": round(variance, 2),
-                "revenue_std_dev": round(std_dev, 2),
-                "stability_score": round(stability_score, 4),
+                "avg_revenue": mean_fare,
+                "revenue_variance": variance,
+                "revenue_std_dev": std_dev,
+                "stability_score": stability_score,
             }
 
         print(f"✓ Computed revenue metrics for {len(self.zone_revenue_metrics)} zones")
-        print(f"  Variance calculated manually using: sum((x - mean)^2) / n")
+        print(f"  Variance calculated manually using: sum((x - mean)^2) / n (exact cent sums, one pass)")
         print(f"  Stability score = 1 - (std_dev / max_std)")
 
     def compute_risk_scores(self):
@@ -184,74 +349,82 @@ class RiskEngine:
         print("-" * 70)
 
         # Find normalization factors
-        max_trip_count = max(
-            (m["trip_count"] for m in self.zone_hour_metrics.values()),
-            default=1
-        )
+        zone_hour = self.zone_hour_metrics
+        max_trip_count = max(zone_hour["trip_count"], default=1)
 
-        max_volatility = max(
-            (m["revenue_std_dev"] for m in self.zone_revenue_metrics.values()),
-            default=1
-        )
+        # Volatility is scored on the published (2-decimal) std dev
+        std_dev_by_zone = {
+            zone_id: round(m["revenue_std_dev"], FIELD_DECIMALS["revenue_std_dev"])
+            for zone_id, m in self.zone_revenue_metrics.items()
+        }
+        max_volatility = max(std_dev_by_zone.values(), default=1)
 
         # Preprocess normalization
         if max_volatility == 0:
             max_volatility = 1
 
+        # Hoist weights out of the loop and compute the volatility component
+        # once per zone into a dense table indexed by zone_id (0.0 if no fares)
+        density_weight = RISK_WEIGHTS["density"]
+        late_night_weight = RISK_WEIGHTS["late_night"]
+        volatility_weight = RISK_WEIGHTS["volatility"]
+        volatility_component_by_zone = [0.0] * self.accumulator.n_zones
+        for zone_id, std_dev in std_dev_by_zone.items():
+            volatility_component_by_zone[zone_id] = volatility_weight * (std_dev / max_volatility)
+
+        # Highest & lowest risk are tracked in the same pass, compared on the
+        # published (rounded) score so first-wins ties match the JSON output
+        highest_risk = lowest_risk = None
+        risk_decimals = FIELD_DECIMALS["risk_score"]
+
+        scores = self.zone_risk_scores
+        density_col = scores["density_component"]
+        late_night_col = scores["late_night_component"]
+        volatility_col = scores["volatility_component"]
+        risk_col = scores["risk_score"]
+
         # Compute risk for each zone-hour combination
-        for (zone_id, hour), metrics in self.zone_hour_metrics.items():
-            # Step 1: Normalize trip density (0-1)
-            trip_count = metrics["trip_count"]
-            density_normalized = trip_count / max_trip_count if max_trip_count > 0 else 0
-
-            # Step 2: Late night factor (1.0 if late night, else 0.0)
-            late_night_factor = 1.0 if hour in LATE_NIGHT_HOURS else 0.0
-
-            # Step 3: Normalize volatility (0-1)
-            volatility_normalized = 0.0
-            if zone_id in self.zone_revenue_metrics:
-                std_dev = self.zone_revenue_metrics[zone_id]["revenue_std_dev"]
-                volatility_normalized = std_dev / max_volatility if max_volatility > 0 else 0
-
-            # Step 4: Weighted risk calculation
-            risk_score = (
-                RISK_WEIGHTS["density"] * density_normalized
-                + RISK_WEIGHTS["late_night"] * late_night_factor
-                + RISK_WEIGHTS["volatility"] * volatility_normalized
-            )
+        for zone_id, hour, trip_count in zip(
+            zone_hour["zone_id"], zone_hour["hour"], zone_hour["trip_count"]
+        ):
+            # Step 1: Weighted trip density, normalized to 0-1
+            density_component = density_weight * (trip_count / max_trip_count)
 
-            # Clamp to 0-1 range
+            # Step 2: Late night factor (weight if late night, else 0.0)
+            late_night_component = late_night_weight * ((LATE_NIGHT_MASK >> hour) & 1)
+
+            # Step 3: Weighted volatility, normalized to 0-1
+            volatility_component = volatility_component_by_zone[zone_id]
+
+            # Step 4: Weighted risk, clamped to 0-1 range
+            risk_score = density_component + late_night_component + volatility_component
             risk_score = max(0, min(1, risk_score))
 
-            self.zone_risk_scores[(zone_id, hour)] = {
-                "zone_id": zone_id,
-                "hour": hour,
-                "trip_count": trip_count,
-                "density_component": round(RISK_WEIGHTS["density"] * density_normalized, 4),
-                "late_night_component": round(RISK_WEIGHTS["late_night"] * late_night_factor, 4),
-                "volatility_component": round(RISK_WEIGHTS["volatility"] * volatility_normalized, 4),
-                "risk_score": round(risk_score, 4),
-            }
+            density_col.append(density_component)
+            late_night_col.append(late_night_component)
+            volatility_col.append(volatility_component)
+            risk_col.append(risk_score)
 
-        print(f"✓ Computed risk scores for {len(self.zone_risk_scores)} zone-hour combinations")
+            published_score = round(risk_score, risk_decimals)
+            if highest_risk is None or published_score > highest_risk[2]:
+                highest_risk = (zone_id, hour, published_score)
+            if lowest_risk is None or published_score < lowest_risk[2]:
+                lowest_risk = (zone_id, hour, published_score)
+
+        scores["zone_id"] = list(zone_hour["zone_id"])
+        scores["hour"] = list(zone_hour["hour"])
+        scores["trip_count"] = list(zone_hour["trip_count"])
+
+        print(f"✓ Computed risk scores for {len(risk_col)} zone-hour combinations")
         print(f"  Formula: {RISK_WEIGHTS['density']:.1%} density + "
               f"{RISK_WEIGHTS['late_night']:.1%} late-night + "
               f"{RISK_WEIGHTS['volatility']:.1%} volatility")
 
-        # Find highest & lowest risk
-        if self.zone_risk_scores:
-            highest_risk = max(
-                self.zone_risk_scores.items(),
-                key=lambda x: x[1]["risk_score"]
-            )
-            lowest_risk = min(
-                self.zone_risk_scores.items(),
-                key=lambda x: x[1]["risk_score"]
-            )
-            print(f"  Highest risk: Zone {highest_risk[0][0]}, Hour {highest_risk[0][1]} "
-                  f"(score: {highest_risk[1]['risk_score']:.4f})")
-            print(f"  Lowest risk: Zone {lowest_risk[0][0]}, Hour {lowest_risk[0][1]} "
-                  f"(score: {lowest_risk[1]['risk_score']:.4f})")
+        if highest_risk is not None:
+            print(f"  Highest risk: Zone {highest_risk[0]}, Hour {highest_risk[1]} "
+                  f"(score: {highest_risk[2]:.4f})")
+            print(f"  Lowest risk: Zone {lowest_risk[0]}, Hour {lowest_risk[1]} "
+                  f"(score: {lowest_risk[2]:.4f})")
 
     def write_metrics_to_json(self):
         """Write computed metrics to JSON files."""
@@ -260,58 +433,92 @@ class RiskEngine:
         print("-" * 70)
 
         try:
-            # Convert zone-hour tuples to strings for JSON serialization
-            zone_hour_metrics_serialized = {}
-            for (zone_id, hour), metrics in self.zone_hour_metrics.items():
-                key = f"{zone_id}_{hour}"
-                zone_hour_metrics_serialized[key] = metrics
-
-            with open(ZONE_HOUR_METRICS_JSON, "w", encoding="utf-8") as f:
-                json.dump(zone_hour_metrics_serialized, f, indent=2)
+            # Key zone-hour rows by "<zone_id>_<hour>" for JSON serialization
+            zone_hour_metrics_serialized = _key_by_zone_hour(self.zone_hour_metrics)
+
+            _dump_json(ZONE_HOUR_METRICS_JSON, zone_hour_metrics_serialized)
             print(f"✓ Wrote {len(zone_hour_metrics_serialized)} zone-hour metrics to:")
             print(f"  {ZONE_HOUR_METRICS_JSON}")
 
-            with open(ZONE_REVENUE_METRICS_JSON, "w", encoding="utf-8") as f:
-                json.dump(self.zone_revenue_metrics, f, indent=2)
+            _dump_json(ZONE_REVENUE_METRICS_JSON, {
+                zone_id: _rounded(metrics)
+                for zone_id, metrics in self.zone_revenue_metrics.items()
+            })
             print(f"✓ Wrote {len(self.zone_revenue_metrics)} zone revenue metrics to:")
             print(f"  {ZONE_REVENUE_METRICS_JSON}")
 
-            # Convert zone-hour tuples for risk scores
-            zone_risk_scores_serialized = {}
-            for (zone_id, hour), score in self.zone_risk_scores.items():
-                key = f"{zone_id}_{hour}"
-                zone_risk_scores_serialized[key] = score
+            # Same keyed layout for risk scores
+            zone_risk_scores_serialized = _key_by_zone_hour(self.zone_risk_scores)
 
-            with open(ZONE_RISK_SCORES_JSON, "w", encoding="utf-8") as f:
-                json.dump(zone_risk_scores_serialized, f, indent=2)
+            _dump_json(ZONE_RISK_SCORES_JSON, zone_risk_scores_serialized)
             print(f"✓ Wrote {len(zone_risk_scores_serialized)} risk scores to:")
             print(f"  {ZONE_RISK_SCORES_JSON}")
+            self.saved_formats.append("JSON")
 
         except Exception as e:
             print(f"✗ Error writing metrics: {e}")
 
+    def write_metrics_to_parquet(self):
+        """
+        Write computed metrics to zstd-compressed Parquet files (needs pyarrow).
+        Values are stored at full precision; zone_id/hour are dictionary-encoded.
+        """
+        print("\n" + "-" * 70)
+        print("WRITING METRICS TO PARQUET FILES")
+        print("-" * 70)
+
+        if pq is None:
+            print("✗ pyarrow is not installed; skipping Parquet output")
+            return
+
+        revenue_fields = ("zone_id", "avg_revenue", "revenue_variance",
+                          "revenue_std_dev", "stability_score")
+        revenue_columns = {
+            field: [metrics[field] for metrics in self.zone_revenue_metrics.values()]
+            for field in revenue_fields
+        }
+
+        outputs = [
+            (ZONE_HOUR_METRICS_PARQUET, self.zone_hour_metrics, "zone-hour metrics"),
+            (ZONE_REVENUE_METRICS_PARQUET, revenue_columns, "zone revenue metrics"),
+            (ZONE_RISK_SCORES_PARQUET, self.zone_risk_scores, "risk scores"),
+        ]
+
+        try:
+            for path, columns, label in outputs:
+                table = pa.table(columns)
+                pq.write_table(table, path, compression="zstd")
+                print(f"✓ Wrote {table.num_rows} {label} to:")
+                print(f"  {path}")
+            self.saved_formats.append("Parquet")
+        except Exception as e:
+            print(f"✗ Error writing Parquet metrics: {e}")
+
     def print_summary(self):
         """Print comprehensive summary."""
         print("\n" + "=" * 70)
         print("RISK ENGINE SUMMARY")
         print("=" * 70)
-        print(f"Zone-hour combinations: {len(self.zone_hour_metrics)}")
-        print(f"Unique zones: {len(set(zone_id for zone_id, _ in self.zone_hour_metrics.keys()))}")
-        print(f"Risk scores computed: {len(self.zone_risk_scores)}")
+        print(f"Zone-hour combinations: {len(self.zone_hour_metrics['zone_id'])}")
+        print(f"Unique zones: {len(set(self.zone_hour_metrics['zone_id']))}")
+        print(f"Risk scores computed: {len(self.zone_risk_scores['risk_score'])}")
         print(f"Revenue volatility analysis: {len(self.zone_revenue_metrics)} zones")
         print("=" * 70 + "\n")
 
     def run(self):
         """Execute full risk engine pipeline."""
         self.load_cleaned_data()
-        if not self.cleaned_trips:
+        if not self.trip_count:
             print("✗ No data to process")
             return None
 
         self.compute_exposure_density()
         self.compute_revenue_volatility()
         self.compute_risk_scores()
-        self.write_metrics_to_json()
+        if WRITE_JSON_METRICS:
+            self.write_metrics_to_json()
+        if WRITE_PARQUET_METRICS:
+            self.write_metrics_to_parquet()
         self.print_summary()
 
         return {
@@ -322,8 +529,22 @@ class RiskEngine:
 
 
 if __name__ == "__main__":
-    engine = RiskEngine()
+    parser = argparse.ArgumentParser(description="Compute zone-hour risk metrics")
+    parser.add_argument(
+        "shards", nargs="*",
+        help=f"cleaned-trip CSV shards (default: {CLEANED_TRIPS_CSV})",
+    )
+    parser.add_argument(
+        "--n-procs", type=int, default=1,
+        help="worker processes used to accumulate shards in parallel",
+    )
+    args = parser.parse_args()
+
+    engine = RiskEngine(shard_paths=args.shards, n_procs=args.n_procs)
     results = engine.run()
     print(f"✓ Risk engine pipeline complete!")
     if results:
-        print(f"  All metrics computed and saved to JSON files.")
+        if engine.saved_formats:
+            print(f"  All metrics computed and saved to {' and '.join(engine.saved_formats)} files.")
+        else:
+            print(f"  All metrics computed; no metric files were written.")